@@ -53,7 +53,7 @@ class MyProtocol(QuicConnectionProtocol):
             if len(self.parts) < end:
                 return
 
-            self.event_mgr.cache.put_nowait((self._quic.host_cid, self.parts[2: end]))
+            self.event_mgr.put_data((self._quic.host_cid, self.parts[2: end]))
             self.parts = self.parts[end:]
 
     async def generate_stream(self):
@@ -4,7 +4,11 @@
 @Author: Jijingyuan
 """
 import abc
+import asyncio
 import numpy as np
+from collections import deque
+from enum import IntEnum
+from types import MappingProxyType
 from typing import Optional, List, Dict, Any
 
 from pydantic import UUID4
@@ -16,22 +20,58 @@ from .onlineLoggerUtil import OnlineLogger
 logger = generate_logger()
 
 
+class OrderStatus(IntEnum):
+    PENDING = 0
+    WAITING = 1
+    TRIGGERED = 2
+    PARTIAL_FILLED = 3
+    CANCELING = 4
+    TERMINAL = 5  # canceled / error / filled
+
+
+class SnifferStatus(IntEnum):
+    PENDING = 0
+    WAITING = 1
+    TERMINAL = 2  # triggered / canceled / error
+
+
+# 状态优先级，数值越大越靠后；模块级只读，热路径可直接引用避免类属性查找
+ORDER_STATUS = MappingProxyType({
+    STATUS_PENDING: OrderStatus.PENDING,
+    STATUS_WAITING: OrderStatus.WAITING,
+    STATUS_TRIGGERED: OrderStatus.TRIGGERED,
+    STATUS_PARTIAL_FILLED: OrderStatus.PARTIAL_FILLED,
+    STATUS_CANCELING: OrderStatus.CANCELING,
+    STATUS_CANCELED: OrderStatus.TERMINAL,
+    STATUS_ERROR: OrderStatus.TERMINAL,
+    STATUS_FILLED: OrderStatus.TERMINAL
+})
+
+SNIFFER_STATUS = MappingProxyType({
+    STATUS_PENDING: SnifferStatus.PENDING,
+    STATUS_WAITING: SnifferStatus.WAITING,
+    STATUS_TRIGGERED: SnifferStatus.TERMINAL,
+    STATUS_CANCELED: SnifferStatus.TERMINAL,
+    STATUS_ERROR: SnifferStatus.TERMINAL
+})
+
+
 class SignalBase(abc.ABC):
     @abc.abstractmethod
-    def update_state(self, _current_ts: float, _data: Dict[str, np.ndarray]):
+    def update_state(self, _current_ts: float, _data: Dict[str, TickColumns]):
         """
         update state base on the data
         :param _current_ts: current timestamp
-        :param _data: {symbol: np.ndarray[[recv_ts, exchange_ts, price, amount, direction], ...], ...}
+        :param _data: {symbol: TickColumns(recv_ts, exchange_ts, price, amount, direction), ...}
         """
         pass
     
     @abc.abstractmethod
-    def generate_signals(self, _current_ts: float, _data: Dict[str, np.ndarray]) -> Optional[Signal]:
+    def generate_signals(self, _current_ts: float, _data: Dict[str, TickColumns]) -> Optional[Signal]:
         """
         generate signal to execution module
         :param _current_ts: current timestamp
-        :param _data: {symbol: np.ndarray[[recv_ts, exchange_ts, price, amount, direction], ...], ...}
+        :param _data: {symbol: TickColumns(recv_ts, exchange_ts, price, amount, direction), ...}
         :return: Signal
         class Signal:
             batch_id: str  # str(uuid)
@@ -63,11 +103,11 @@ class TargetBase(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def generate_targets(self, _current_ts: float, _data: Dict[str, np.ndarray]) -> Optional[Target]:
+    def generate_targets(self, _current_ts: float, _data: Dict[str, TickColumns]) -> Optional[Target]:
         """
         generate target dict that could be used in intercept modeling
         :param _current_ts: current timestamp
-        :param _data: {symbol: np.ndarray[[recv_ts, exchange_ts, price, amount, direction], ...], ...}
+        :param _data: {symbol: TickColumns(recv_ts, exchange_ts, price, amount, direction), ...}
         :return: None or Target
         """
         pass
@@ -101,20 +141,20 @@ class TargetBase(abc.ABC):
 
 class FeatureBase(abc.ABC):
     @abc.abstractmethod
-    def update_state(self, _current_ts: float, _data: Dict[str, np.ndarray]):
+    def update_state(self, _current_ts: float, _data: Dict[str, TickColumns]):
         """
         update state base on the data
         :param _current_ts: current timestamp
-        :param _data: {symbol: np.ndarray[[recv_ts, exchange_ts, price, amount, direction], ...], ...}
+        :param _data: {symbol: TickColumns(recv_ts, exchange_ts, price, amount, direction), ...}
         """
         pass
 
     @abc.abstractmethod
-    def generate_features(self, _current_ts: float, _data: Dict[str, np.ndarray]) -> Optional[Features]:
+    def generate_features(self, _current_ts: float, _data: Dict[str, TickColumns]) -> Optional[Features]:
         """
         generate features dict based on the state
         :param _current_ts: current timestamp
-        :param _data: {symbol: np.ndarray[[recv_ts, exchange_ts, price, amount, direction], ...], ...}
+        :param _data: {symbol: TickColumns(recv_ts, exchange_ts, price, amount, direction), ...}
         :return: None or Features
         """
         pass
@@ -136,6 +176,39 @@ class FeatureBase(abc.ABC):
         pass
 
 
+class SingleSymbolFeatureBase(FeatureBase):
+    def get_symbol_id(self, _symbol: str) -> int:
+        """
+        get dense int id of the symbol, ids are assigned in order of first appearance
+        :param _symbol: 'btc_usdt|binance_future'
+        :return: symbol id
+        """
+        try:
+            sym_to_id = self._sym_to_id
+        except AttributeError:
+            # 首次使用时创建，子类自定义__init__时无需调用super().__init__()
+            sym_to_id = self._sym_to_id = {}
+
+        sym_id = sym_to_id.get(_symbol)
+        if sym_id is None:
+            sym_id = sym_to_id[_symbol] = len(sym_to_id)
+        return sym_id
+
+    def update_state(self, _current_ts: float, _data: Dict[str, TickColumns]):
+        for symbol, trades in _data.items():
+            self.update_state_single(_current_ts, self.get_symbol_id(symbol), trades)
+
+    @abc.abstractmethod
+    def update_state_single(self, _current_ts: float, _symbol_id: int, _trades: TickColumns):
+        """
+        update state of a single symbol, no dict involved so the columns can be passed to numba kernels directly
+        :param _current_ts: current timestamp
+        :param _symbol_id: dense int id of the symbol, see get_symbol_id
+        :param _trades: TickColumns(recv_ts, exchange_ts, price, amount, direction)
+        """
+        pass
+
+
 class SelectorBase(abc.ABC):
     @abc.abstractmethod
     def select_features(self, _features: Features, _target: Target) -> Optional[List[str]]:
@@ -207,10 +280,10 @@ class PerformanceBase(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def generate_trading_result(self, _data: Dict[str, np.ndarray]) -> Optional[TradingResult]:
+    def generate_trading_result(self, _data: Dict[str, TickColumns]) -> Optional[TradingResult]:
         """
         generate trading result for signals
-        :param _data: {symbol: np.ndarray[[recv_ts, exchange_ts, price, amount, direction], ...], ...}
+        :param _data: {symbol: TickColumns(recv_ts, exchange_ts, price, amount, direction), ...}
         :return: TradingResult
         """
         pass
@@ -319,44 +392,65 @@ class LiquidityBase(abc.ABC):
 
 
 class OrderBase(abc.ABC):
-    ORDER_STATUS = {
-        'pending': 0,
-        'waiting': 1,
-        'triggered': 2,
-        'partial_filled': 3,
-        'canceling': 4,
-        'canceled': 5,
-        'error': 5,
-        'filled': 5
-    }
-
-    SNIFFER_STATUS = {
-        'pending': 0,
-        'waiting': 1,
-        'triggered': 2,
-        'canceled': 2,
-        'error': 2
-    }
+    ORDER_STATUS = ORDER_STATUS
+    SNIFFER_STATUS = SNIFFER_STATUS
 
     def __init__(self):
         self._precision_dict: Dict[str, PrecisionDict] = {}
 
     def format_amount(self, _symbol, _amount, _upper=True) -> float:
-        amount_p = self._precision_dict[_symbol].amount
-        factor = 10 ** amount_p
-        int_amount = int(_amount * factor)
+        # 整数tick除以10的幂次即为该精度下最接近的浮点数，无需再round
+        factor = self._precision_dict[_symbol].amount_factor
         bias = 1 if _upper else 0
-        return round((int_amount + bias) / factor, amount_p)
+        return (int(_amount * factor) + bias) / factor
 
     def format_price(self, _symbol, _price, _upper=True) -> float:
-        price_p = self._precision_dict[_symbol].price
-        factor = 10 ** price_p
-        int_price = int(_price * factor)
+        factor = self._precision_dict[_symbol].price_factor
         bias = 1 if _upper else 0
-        return round((int_price + bias) / factor, price_p)
+        return (int(_price * factor) + bias) / factor
+
+    # _upper在调用处固定时使用以下特化版本，省去bias分支
+    def format_amount_up(self, _symbol, _amount) -> float:
+        factor = self._precision_dict[_symbol].amount_factor
+        return (int(_amount * factor) + 1) / factor
+
+    def format_amount_down(self, _symbol, _amount) -> float:
+        factor = self._precision_dict[_symbol].amount_factor
+        return int(_amount * factor) / factor
+
+    def format_price_up(self, _symbol, _price) -> float:
+        factor = self._precision_dict[_symbol].price_factor
+        return (int(_price * factor) + 1) / factor
+
+    def format_price_down(self, _symbol, _price) -> float:
+        factor = self._precision_dict[_symbol].price_factor
+        return int(_price * factor) / factor
+
+    def format_amounts(self, _symbol, _amounts: np.ndarray, _upper=True) -> np.ndarray:
+        # 批量版本，与format_amount的截断+bias逻辑一致
+        factor = self._precision_dict[_symbol].amount_factor
+        scaled = np.trunc(np.ascontiguousarray(_amounts, dtype=np.float64) * factor)
+        if _upper:
+            scaled += 1
+        return scaled / factor
+
+    def format_prices(self, _symbol, _prices: np.ndarray, _upper=True) -> np.ndarray:
+        factor = self._precision_dict[_symbol].price_factor
+        scaled = np.trunc(np.ascontiguousarray(_prices, dtype=np.float64) * factor)
+        if _upper:
+            scaled += 1
+        return scaled / factor
     
     @abc.abstractmethod
-    async def get_batch_price(self, _symbol, _start_ts, _end_ts) -> np.ndarray:
+    async def get_batch_price(self, _symbol, _start_ts, _end_ts, _out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        get trades of the symbol between _start_ts and _end_ts
+        :param _symbol: 'btc_usdt|binance_future'
+        :param _out: optional preallocated buffer of dtype TRADE_DTYPE, e.g. np.empty(n, dtype=TRADE_DTYPE)
+                     allocated once by the caller and reused across calls; implementers fill it in place
+                     and return the filled view _out[:count], allocating only when _out is None or too short
+        :return: structured array of dtype TRADE_DTYPE, see TickColumns.from_records
+        """
         pass
 
     @abc.abstractmethod
@@ -497,3 +591,61 @@ class ExecuteBase(abc.ABC):
         :param _status: module status
         """
         pass
+
+
+class QuicEventBase:
+    def __init__(self):
+        self.connections: Dict[bytes, Any] = {}
+        # 单消费者缓存，deque + Event 比 asyncio.Queue 每次put/get少一次Future开销
+        self._cache: deque = deque()
+        # 消费者第一次等待时才创建，未启用的实例不分配Event
+        self._cache_event: Optional[asyncio.Event] = None
+
+    def on_connected(self, _host_id: bytes):
+        pass
+
+    def on_disconnected(self, _host_id: bytes):
+        pass
+
+    async def loop_service(self):
+        pass
+
+    def put_data(self, _data):
+        self._cache.append(_data)
+        if self._cache_event is not None:
+            self._cache_event.set()
+
+    async def get_data(self):
+        while not self._cache:
+            if self._cache_event is None:
+                self._cache_event = asyncio.Event()
+            await self._cache_event.wait()
+
+        data = self._cache.popleft()
+        if not self._cache and self._cache_event is not None:
+            self._cache_event.clear()
+
+        return data
+
+    async def send_msg(self, _host_id: bytes, _msg: bytes):
+        connection = self.connections.get(_host_id)
+        if connection is None:
+            return
+
+        await connection.send_msg(_msg)
+
+    async def send_all(self, _msg: bytes):
+        connections = list(self.connections.values())
+        if not connections:
+            return
+
+        # 单连接是最常见的情况，直接await，省去创建task的开销
+        if len(connections) == 1:
+            await connections[0].send_msg(_msg)
+            return
+
+        # 广播时单个连接失败不能取消其他连接的发送，异常逐个记录
+        results = await asyncio.gather(*[v.send_msg(_msg) for v in connections], return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f'send_all failed: {result!r}')
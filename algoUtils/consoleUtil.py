@@ -1,16 +1,31 @@
 from typing import Callable, List, Optional, Dict
 from langchain_core.messages import HumanMessage, AnyMessage
 import re
+import sys
+import textwrap
+
+# 匹配```并以前瞻捕获其所在行的剩余部分，不消耗该行，同一行内后续的```仍能被扫描到
+_FENCE_RE = re.compile(r'```(?=([^\n]*))')
+# 统一使用带文件名的匹配模式（python与markdown保持一致）
+_PY_FENCE_RE = re.compile(r'```python:\s*"?(?P<filename>[^"\n]+?_V\d)"?(?=\s|:|$)')
+# 严格匹配md:前缀的代码块
+_MD_FENCE_RE = re.compile(r'```md:\s*"?(?P<filename>[^"\n]+?_V\d)"?(?=\s|:|$)')
+
 
 class ConsoleOutput:
     @classmethod
     def console_for_str(cls, _message: AnyMessage):
-        for char in _message.content:
-            print(char, end='', flush=True)
+        # 字符串内容整体写出一次，不再逐字符print
+        if isinstance(_message.content, str):
+            sys.stdout.write(_message.content)
+            sys.stdout.flush()
+        else:
+            for block in _message.content:
+                print(block, end='', flush=True)
 
     @classmethod
     def console_for_stream(cls, _source_name: str, _msg_generator: Callable, _llm_msg: Optional[List[AnyMessage]]=None):
-        content = ""
+        parts = []
         print('----------------{}----------------'.format(_source_name))
         print()
 
@@ -21,16 +36,19 @@ class ConsoleOutput:
             print()
         print()
 
+        # 按chunk整体写出并flush，避免逐字符print
+        write = sys.stdout.write
+        flush = sys.stdout.flush
         for chunk in _msg_generator:
             if chunk.content:
-                for char in chunk.content:
-                    content += char
-                    print(char, end='', flush=True)
+                parts.append(chunk.content)
+                write(chunk.content)
+                flush()
             elif chunk.additional_kwargs.get('reasoning_content'):
-                 for char in chunk.additional_kwargs['reasoning_content']:
-                    print(char, end='', flush=True)
+                write(chunk.additional_kwargs['reasoning_content'])
+                flush()
         print()
-        return content
+        return ''.join(parts)
 
 
     @classmethod
@@ -47,167 +65,57 @@ class ConsoleOutput:
         修改为返回字典格式，支持多个Python脚本提取
         返回格式：{文件名: 脚本内容}
         """
-        py_scripts = {}
-        # 统一使用带文件名的匹配模式（与markdown处理保持一致）
-        pattern = re.compile(r'```python:\s*"?(?P<filename>[^"\n]+?_V\d)"?(?=\s|:|$)')
-        
-        pos = 0
-        while pos < len(content):
-            match = pattern.search(content, pos)
-            if not match:
-                break
-            
-            filename = match.group('filename').strip()
-            content_start = match.end()
-            
-            # 嵌套代码块处理逻辑
-            depth = 1
-            content_end = content_start
-            last_valid_end = content_start
-            
-            while depth > 0 and content_end < len(content):
-                next_triple = content.find('```', content_end)
-                if next_triple == -1:
-                    break
-                
-                # 判断是代码块开始还是结束
-                line_end = content.find('\n', next_triple + 3)
-                if line_end == -1:
-                    line_end = len(content)
-                    
-                # 检查是否包含语言标识
-                has_lang = False
-                lang_part = content[next_triple+3 : line_end].strip()
-                if lang_part:
-                    if ':' in lang_part:
-                        has_lang = True
-                    else:
-                        has_lang = not lang_part.startswith((' ', '\t', '\n', '\r'))
-                
-                if has_lang:
-                    depth += 1
-                    content_end = next_triple + 3
-                else:
-                    depth -= 1
-                    last_valid_end = next_triple  # 记录有效结束位置
-                    content_end = next_triple + 3
-
-            if depth == 0:
-                # 提取原始内容（保留嵌套结构）
-                raw_content = content[content_start:last_valid_end]
-                
-                # 统一缩进处理
-                lines = []
-                min_indent = float('inf')
-                
-                # 计算最小缩进（跳过空行）
-                for line in raw_content.split('\n'):
-                    stripped = line.lstrip()
-                    if stripped:
-                        indent = len(line) - len(stripped)
-                        min_indent = min(min_indent, indent)
-                
-                # 应用缩进清理
-                for line in raw_content.split('\n'):
-                    if line.strip():
-                        adjusted_line = line[min_indent:] if min_indent != float('inf') else line
-                        lines.append(adjusted_line.rstrip())  # 移除行尾空白
-                    else:
-                        lines.append('')  # 保留空行
-                        
-                cleaned_content = '\n'.join(lines).strip()
-                
-                if filename and cleaned_content:
-                    py_scripts[filename] = cleaned_content  # 改为存储到字典
-                    
-                pos = content_end
-            else:
-                pos = last_valid_end
-        
-        return py_scripts  # 返回字典而不是字符串
+        return _extract_fenced(content, _PY_FENCE_RE)
 
     @staticmethod
     def extract_markdown_files(content: str) -> Dict[str, str]:
         """
         改进版：修复嵌套代码块解析问题
         """
-        md_files = {}
-        # 严格匹配md:前缀的代码块
-        pattern = re.compile(r'```md:\s*"?(?P<filename>[^"\n]+?_V\d)"?(?=\s|:|$)')
-        
-        pos = 0
-        while pos < len(content):
-            match = pattern.search(content, pos)
-            if not match:
-                break
-                
-            filename = match.group('filename').strip()
-            content_start = match.end()
-            
-            # 改进的嵌套解析逻辑
-            depth = 1
-            content_end = content_start
-            last_valid_end = content_start
-            
-            while depth > 0 and content_end < len(content):
-                next_triple = content.find('```', content_end)
-                if next_triple == -1:
-                    break
-                
-                # 判断是代码块开始还是结束
-                line_end = content.find('\n', next_triple + 3)
-                if line_end == -1:
-                    line_end = len(content)
-                    
-                # 检查```后的内容是否包含语言标识
-                has_lang = False
-                lang_part = content[next_triple+3 : line_end].strip()
-                if lang_part:
-                    if ':' in lang_part:
-                        has_lang = True
-                    else:
-                        # 简单语言标识（如math）
-                        has_lang = not lang_part.startswith((' ', '\t', '\n', '\r'))
-                
-                if has_lang:
-                    depth += 1
-                    # 移动到下一个```之后
-                    content_end = next_triple + 3
-                else:
-                    depth -= 1
-                    last_valid_end = next_triple  # 记录有效结束位置
-                    content_end = next_triple + 3  # 移动到结束```之后
+        return _extract_fenced(content, _MD_FENCE_RE)
 
-            if depth == 0:
-                # 提取原始内容（包含所有嵌套结构）
-                raw_content = content[content_start:last_valid_end]
-                
-                # 改进的缩进处理
-                lines = []
-                min_indent = float('inf')
-                
-                # 计算最小缩进（跳过空行）
-                for line in raw_content.split('\n'):
-                    stripped = line.lstrip()
-                    if stripped:
-                        indent = len(line) - len(stripped)
-                        min_indent = min(min_indent, indent)
-                
-                # 应用缩进清理（保留空行原样）
-                for line in raw_content.split('\n'):
-                    if line.strip():
-                        adjusted_line = line[min_indent:] if min_indent != float('inf') else line
-                        lines.append(adjusted_line.rstrip())  # 移除行尾空白
-                    else:
-                        lines.append('')  # 保留空行
-                        
-                cleaned_content = '\n'.join(lines).strip()
-                
-                if filename and cleaned_content:
-                    md_files[filename] = cleaned_content
-                    
-                pos = content_end
+
+def _extract_fenced(content: str, pattern: re.Pattern) -> Dict[str, str]:
+    """
+    提取pattern匹配到的带文件名代码块，支持嵌套代码块
+    返回格式：{文件名: 代码块内容}
+    """
+    blocks = {}
+    pos = 0
+    while pos < len(content):
+        match = pattern.search(content, pos)
+        if not match:
+            break
+
+        filename = match.group('filename').strip()
+        content_start = match.end()
+
+        # 嵌套代码块处理逻辑：```后同一行有内容（语言标识）视为开始，否则为结束
+        depth = 1
+        content_end = content_start
+        last_valid_end = content_start
+        for fence in _FENCE_RE.finditer(content, content_start):
+            if fence.group(1).strip():
+                depth += 1
             else:
-                pos = last_valid_end  # 跳过未闭合部分
-                
-        return md_files
+                depth -= 1
+                last_valid_end = fence.start()  # 记录有效结束位置
+            content_end = fence.end()
+            if depth == 0:
+                break
+
+        if depth == 0:
+            # 提取原始内容（保留嵌套结构）
+            raw_content = content[content_start:last_valid_end]
+
+            # 统一缩进处理：先移除行尾空白（含CRLF的\r，空行保留），再去除公共缩进
+            cleaned_content = textwrap.dedent('\n'.join(line.rstrip() for line in raw_content.split('\n'))).strip()
+
+            if filename and cleaned_content:
+                blocks[filename] = cleaned_content
+
+            pos = content_end
+        else:
+            pos = last_valid_end  # 跳过未闭合部分
+
+    return blocks
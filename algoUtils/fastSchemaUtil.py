@@ -0,0 +1,198 @@
+"""
+@Create: 2026/10/15 10:00
+@File: fastSchemaUtil.py
+内部热路径使用的轻量数据结构：slots dataclass，不做pydantic校验
+对外接口仍使用schemaUtil中的pydantic模型，边界处通过from_pydantic/to_pydantic转换
+"""
+from dataclasses import dataclass, fields
+from typing import Optional, List, Dict, Any, Union, Hashable, ClassVar
+from . import schemaUtil
+# 更新消息在schemaUtil中已是msgspec.Struct，直接复用
+from .schemaUtil import STATUS_PENDING, STATUS_TRIGGERED, check_order_fields, UpdateOrderInfo, UpdateSnifferInfo
+from .schemaUtil import EMPTY_DICT, ACTUAL_PASS_SET, ACTUAL_PASS, FORCAST_PASS_SET, FORCAST_PASS, get_pass_flag, set_pass_flag
+
+
+class _FastSchema:
+    __slots__ = ()
+
+    # 对应的pydantic模型
+    _model: ClassVar[type]
+
+    @classmethod
+    def from_pydantic(cls, _model):
+        # 字段值已由pydantic校验过，直接拷贝
+        return cls(**{f.name: getattr(_model, f.name) for f in fields(cls)})
+
+    def to_pydantic(self):
+        return self._model(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+
+@dataclass(slots=True, kw_only=True)
+class Signal(_FastSchema):
+    _model: ClassVar[type] = schemaUtil.Signal
+
+    batch_id: str
+    symbol: Union[str, List[str]]
+    price: Union[float, List[float]]
+    timestamp: float = 0
+    other_info: Optional[Dict[Hashable, Any]] = None
+
+    def __post_init__(self):
+        # 单品种信号不做任何检查，只有列表形式才校验price和symbol
+        if isinstance(self.price, list):
+            if not isinstance(self.symbol, list):
+                raise ValueError("price和symbol必须类型一致，要么都是单个值，要么都是列表")
+            if len(self.price) != len(self.symbol):
+                raise ValueError("当price和symbol都是列表时，长度必须相等")
+        elif isinstance(self.symbol, list):
+            raise ValueError("price和symbol必须类型一致，要么都是单个值，要么都是列表")
+
+    @property
+    def other_info_or_empty(self):
+        return EMPTY_DICT if self.other_info is None else self.other_info
+
+
+@dataclass(slots=True, kw_only=True)
+class Sample(_FastSchema):
+    _model: ClassVar[type] = schemaUtil.Sample
+
+    signal: Signal
+    features: Optional[schemaUtil.Features] = None
+    target: Optional[schemaUtil.Target] = None
+    forcast: Optional[schemaUtil.Target] = None
+    pass_flags: int = 0
+
+    @property
+    def actual_pass(self) -> Optional[bool]:
+        return get_pass_flag(self.pass_flags, ACTUAL_PASS_SET, ACTUAL_PASS)
+
+    @actual_pass.setter
+    def actual_pass(self, _value: Optional[bool]):
+        self.pass_flags = set_pass_flag(self.pass_flags, ACTUAL_PASS_SET, ACTUAL_PASS, _value)
+
+    @property
+    def forcast_pass(self) -> Optional[bool]:
+        return get_pass_flag(self.pass_flags, FORCAST_PASS_SET, FORCAST_PASS)
+
+    @forcast_pass.setter
+    def forcast_pass(self, _value: Optional[bool]):
+        self.pass_flags = set_pass_flag(self.pass_flags, FORCAST_PASS_SET, FORCAST_PASS, _value)
+
+    @classmethod
+    def from_pydantic(cls, _model):
+        sample = super(Sample, cls).from_pydantic(_model)
+        sample.signal = Signal.from_pydantic(_model.signal)
+        return sample
+
+    def to_pydantic(self):
+        return self._model(
+            signal=self.signal.to_pydantic(),
+            features=self.features,
+            target=self.target,
+            forcast=self.forcast,
+            pass_flags=self.pass_flags
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class OrderInfo(_FastSchema):
+    _model: ClassVar[type] = schemaUtil.OrderInfo
+
+    order_id: str
+    batch_id: str
+    symbol: str
+    exchange: str
+    order_type: str
+    action: str
+    position: str
+    direction: int = 0
+    amount: float
+    feature: Optional[str] = None
+    expire: Optional[float] = None
+    delay: Optional[float] = None
+    condition: Optional[Dict[str, Any]] = None
+    price: Optional[float] = None
+    status: str = STATUS_PENDING
+    current_timestamp: float
+    send_timestamp: Optional[float] = None
+    receive_timestamp: Optional[float] = None
+    exchange_timestamp: Optional[float] = None
+    local_timestamp: Optional[float] = None
+    trigger_timestamp: Optional[float] = None
+    trigger_local_timestamp: Optional[float] = None
+    execute_price: float = 0.0
+    execute_amount: float = 0.0
+    fee_rate: Optional[float] = None
+    msg: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self):
+        # 与pydantic模型相同的检查，不合法时同样抛出ValueError
+        self.status, self.direction = check_order_fields(self)
+
+    def update(self, _update_info: UpdateOrderInfo):
+        # 时间戳在UpdateOrderInfo构造时已保留6位小数
+        self.status = _update_info.status
+        self.exchange_timestamp = _update_info.exchange_timestamp
+        self.local_timestamp = _update_info.local_timestamp
+        self.execute_price = _update_info.execute_price
+        self.execute_amount = _update_info.execute_amount
+        self.fee_rate = _update_info.fee_rate
+        self.msg = _update_info.msg
+
+        if _update_info.status == STATUS_TRIGGERED:
+            self.trigger_timestamp = _update_info.exchange_timestamp
+            self.trigger_local_timestamp = _update_info.local_timestamp
+
+
+@dataclass(slots=True, kw_only=True)
+class TargetSnifferInfo(_FastSchema):
+    _model: ClassVar[type] = schemaUtil.TargetSnifferInfo
+
+    order_id: str
+    batch_id: str
+    symbol: str
+    exchange: str
+    operator: str
+    target_price: float
+    expire: Optional[float] = None
+    delay: Optional[float] = None
+    status: str = STATUS_PENDING
+    current_timestamp: float
+    exchange_timestamp: Optional[float] = None
+    local_timestamp: Optional[float] = None
+    drop: bool = True
+
+    def update(self, _update_info: UpdateSnifferInfo):
+        self.status = _update_info.status
+        self.exchange_timestamp = _update_info.exchange_timestamp
+        self.local_timestamp = _update_info.local_timestamp
+
+
+@dataclass(slots=True, kw_only=True)
+class TrailingSnifferInfo(_FastSchema):
+    _model: ClassVar[type] = schemaUtil.TrailingSnifferInfo
+
+    order_id: str
+    batch_id: str
+    symbol: str
+    exchange: str
+    operator: str
+    target_price: float
+    back_pct: float
+    expire: Optional[float] = None
+    delay: Optional[float] = None
+    status: str = STATUS_PENDING
+    current_timestamp: float
+    exchange_timestamp: Optional[float] = None
+    local_timestamp: Optional[float] = None
+    other_info: Optional[Dict[str, Any]] = None
+    drop: bool = True
+
+    @property
+    def other_info_or_empty(self):
+        return EMPTY_DICT if self.other_info is None else self.other_info
+
+    def update(self, _update_info: UpdateSnifferInfo):
+        self.status = _update_info.status
+        self.exchange_timestamp = _update_info.exchange_timestamp
+        self.local_timestamp = _update_info.local_timestamp
@@ -1,5 +1,6 @@
 import time
-from functools import wraps
+from contextvars import ContextVar
+from functools import update_wrapper
 from .loggerUtil import generate_logger
 import asyncio
 import inspect
@@ -7,72 +8,160 @@ import inspect
 
 logger = generate_logger()
 
+# 发布模式下装饰器只复制__name__/__qualname__，跳过functools.wraps的完整属性拷贝
+PROFILE_RELEASE = False
+
+
+def _wrap(wrapper, func):
+    if PROFILE_RELEASE:
+        wrapper.__name__ = getattr(func, '__name__', wrapper.__name__)
+        wrapper.__qualname__ = getattr(func, '__qualname__', wrapper.__qualname__)
+        return wrapper
+    return update_wrapper(wrapper, func)
+
+
+# 当前协程帧内已完成的被装饰子协程耗时之和，外层据此计算自身耗时；None表示不在被装饰协程内
+_child_cost_ns = ContextVar('_child_cost_ns', default=None)
+
+
+class _Stat:
+    """Per-function statistics, slotted for fixed-offset attribute access"""
+    __slots__ = ('total_cost_ns', 'self_cost_ns', 'call_count', 'min_time_ns', 'max_time_ns')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.total_cost_ns = 0
+        self.self_cost_ns = 0
+        self.call_count = 0
+        self.min_time_ns = float('inf')
+        self.max_time_ns = 0
+
+    def as_dict(self):
+        # 新的*_ns字段加上原有的秒级字段，兼容旧的func_stats[name]['total_cost']用法
+        return {
+            "total_cost": self.total_cost_ns / 1e9,
+            "call_count": self.call_count,
+            "min_time": self.min_time_ns / 1e9,
+            "max_time": self.max_time_ns / 1e9,
+            "total_cost_ns": self.total_cost_ns,
+            "self_cost_ns": self.self_cost_ns,
+            "min_time_ns": self.min_time_ns,
+            "max_time_ns": self.max_time_ns
+        }
+
+    def __getitem__(self, _key):
+        return self.as_dict()[_key]
+
 
 class ProfileStats:
+    __slots__ = ('name', 'func_stats')
+
     def __init__(self, name="default"):
         self.name = name
         # Remove class-level statistics, only keep function statistics dictionary
+        # {func_name: _Stat}
         self.func_stats = {}
-        
+
     def update_cost_time(self, func):
         """
         Decorator: Calculate the execution time of the decorated function and update statistics
         Each function will have its own statistics data
+        Coroutine functions are detected and timed across the await, see update_cost_time_async
         """
-        func_name = func.__name__
-        # Ensure the function exists in the statistics dictionary
-        if func_name not in self.func_stats:
-            self.func_stats[func_name] = {
-                "total_cost": 0,
-                "call_count": 0
-            }
-        
         # 检查函数是否为异步函数
-        is_async = inspect.iscoroutinefunction(func)
-            
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            end_time = time.time()
-            
-            elapsed = end_time - start_time
-            
-            # Only update function-specific statistics
-            func_stat = self.func_stats[func_name]
-            func_stat["total_cost"] += elapsed
-            func_stat["call_count"] += 1
-            
-            return result
-            
-        @wraps(func)
+        if inspect.iscoroutinefunction(func):
+            return self.update_cost_time_async(func)
+
+        func_stat = self._get_stat(func)
+        # Monotonic integer clock: no float math on the hot path, converted to seconds only for display
+        perf_counter_ns = time.perf_counter_ns
+
         def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = perf_counter_ns()
             result = func(*args, **kwargs)
-            end_time = time.time()
-            
-            elapsed = end_time - start_time
-            
+            elapsed = perf_counter_ns() - start_time
+
+            # Only update function-specific statistics
+            func_stat.total_cost_ns += elapsed
+            func_stat.self_cost_ns += elapsed
+            func_stat.call_count += 1
+            if elapsed < func_stat.min_time_ns:
+                func_stat.min_time_ns = elapsed
+            if elapsed > func_stat.max_time_ns:
+                func_stat.max_time_ns = elapsed
+
+            return result
+
+        return _wrap(sync_wrapper, func)
+
+    def update_cost_time_async(self, func):
+        """
+        Decorator: Same as update_cost_time, but always awaits the result of the decorated callable
+        Use it directly for callables returning awaitables that are not detected as coroutine functions
+        self_cost_ns excludes the time spent in nested decorated coroutines awaited by this one
+        """
+        func_stat = self._get_stat(func)
+        perf_counter_ns = time.perf_counter_ns
+
+        async def async_wrapper(*args, **kwargs):
+            token = _child_cost_ns.set(0)
+            start_time = perf_counter_ns()
+            try:
+                result = await func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start_time
+                child_cost = _child_cost_ns.get()
+                _child_cost_ns.reset(token)
+                # 将本次耗时计入外层被装饰协程的子耗时
+                parent_child_cost = _child_cost_ns.get()
+                if parent_child_cost is not None:
+                    _child_cost_ns.set(parent_child_cost + elapsed)
+
             # Only update function-specific statistics
-            func_stat = self.func_stats[func_name]
-            func_stat["total_cost"] += elapsed
-            func_stat["call_count"] += 1
-            
+            func_stat.total_cost_ns += elapsed
+            func_stat.self_cost_ns += elapsed - child_cost
+            func_stat.call_count += 1
+            if elapsed < func_stat.min_time_ns:
+                func_stat.min_time_ns = elapsed
+            if elapsed > func_stat.max_time_ns:
+                func_stat.max_time_ns = elapsed
+
             return result
-        
-        return async_wrapper if is_async else sync_wrapper
-    
+
+        return _wrap(async_wrapper, func)
+
+    def _get_stat(self, func):
+        # Callable objects have no __name__, fall back to their class name
+        func_name = getattr(func, '__name__', None) or type(func).__name__
+        # Ensure the function exists in the statistics dictionary
+        if func_name not in self.func_stats:
+            self.func_stats[func_name] = _Stat()
+        # Bind the stats record once, the wrappers update it without any dict lookup
+        return self.func_stats[func_name]
+
+    def get_stats(self, func_name=None):
+        """
+        Get statistics as dictionaries
+        Parameters:
+            func_name: Function name, if specified returns statistics for that function, otherwise for all functions
+        """
+        if func_name is not None:
+            func_stat = self.func_stats.get(func_name)
+            if func_stat is None:
+                return None
+
+            return func_stat.as_dict()
+
+        return {name: self.get_stats(name) for name in self.func_stats}
+
     def reset(self):
         """Reset all statistics data"""
-        # Reset function statistics dictionary
-        for func_name in self.func_stats:
-            self.func_stats[func_name] = {
-                "total_cost": 0,
-                "call_count": 0,
-                "min_time": float('inf'),
-                "max_time": 0
-            }
-            
+        # Reset in place, decorated wrappers keep a reference to their stats record
+        for func_stat in self.func_stats.values():
+            func_stat.reset()
+
     def show_stats(self, func_name=None):
         """
         Display statistics information
@@ -81,7 +170,7 @@ class ProfileStats:
         """
         if func_name is not None:
             if func_name in self.func_stats:
-                stats = self.func_stats[func_name]
+                stats = self.get_stats(func_name)
                 if stats["call_count"] == 0:
                     logger.info(f"Function {func_name} has no statistics data yet")
                 else:
@@ -94,7 +183,7 @@ class ProfileStats:
         else:
             # Display overall statistics and statistics for each function
             for func_name in self.func_stats:
-                stats = self.func_stats[func_name]
+                stats = self.get_stats(func_name)
                 if stats["call_count"] > 0:
                     logger.info(f"Function {func_name}: "
                                 f"Call: {stats['call_count']}, "
@@ -3,11 +3,160 @@
 @File: defUtil.py
 @Author: Jijingyuan
 """
-from typing import Optional, List, Dict, Any, Union, Literal, Hashable
-from pydantic import BaseModel, field_validator, model_validator
+import sys
+import msgspec
+import numpy as np
+from types import MappingProxyType
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Set, FrozenSet, Any, Union, Literal, Hashable, ClassVar, Tuple
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, model_validator
+
+# 订单/嗅探器状态常量，显式intern，使状态比较和字典查找走指针相等的快速路径
+STATUS_PENDING = sys.intern('pending')
+STATUS_WAITING = sys.intern('waiting')
+STATUS_TRIGGERED = sys.intern('triggered')
+STATUS_PARTIAL_FILLED = sys.intern('partial_filled')
+STATUS_CANCELING = sys.intern('canceling')
+STATUS_CANCELED = sys.intern('canceled')
+STATUS_ERROR = sys.intern('error')
+STATUS_FILLED = sys.intern('filled')
+
+# (position, action) -> direction
+POSITION_ACTION_DIRECTION = {
+    ('long', 'open'): 1,
+    ('long', 'close'): -1,
+    ('short', 'open'): -1,
+    ('short', 'close'): 1
+}
+
+# other_info未设置时的只读空字典，所有实例共享
+EMPTY_DICT = MappingProxyType({})
+
+
+def _round_timestamp(v):
+    # 时间戳统一保留6位小数，各模型的field_validator共用
+    if v is not None:
+        return round(float(v), 6)
+    return v
+
+
+def round_timestamps(_ts: np.ndarray) -> np.ndarray:
+    """
+    批量将时间戳保留6位小数，原地修改
+    接入端可先对一批时间戳调用一次，再逐个构造UpdateOrderInfo/OrderInfo，构造时的逐个round不会再改变其值
+    注意np.round按乘10^6取整实现，在第7位恰为5附近可能与round()相差1微秒
+    :param _ts: float64数组
+    :return: _ts本身
+    """
+    return np.round(_ts, 6, out=_ts)
+
+
+def set_timestamp(_obj, _name: str, _value: Optional[float]):
+    """
+    单独给订单/嗅探器的时间戳字段赋值时使用，保留6位小数，与field_validator和update()一致
+    :param _obj: OrderInfo / TargetSnifferInfo / TrailingSnifferInfo
+    :param _name: 'send_timestamp'
+    :param _value: timestamp
+    """
+    setattr(_obj, _name, _round_timestamp(_value))
+
+
+_MISSING = object()
 
 
-class Signal(BaseModel):
+def _compile_fast_init(cls):
+    """
+    按模型字段生成不做校验的构造函数：关键字参数直接写入实例__dict__，不再逐字段遍历schema
+    model_construct每次都要遍历model_fields处理默认值，比正常校验还慢，仅用于内部可信数据
+    fields_set视为全部字段
+    :param cls: 字段固定的pydantic模型
+    """
+    namespace = {
+        '_cls': cls, '_new': cls.__new__, '_setattr': object.__setattr__,
+        '_fields': frozenset(cls.model_fields), '_MISSING': _MISSING
+    }
+    params, lines = [], []
+    for name, field_info in cls.model_fields.items():
+        if field_info.is_required():
+            params.append(name)
+        elif field_info.default_factory is not None:
+            # default_factory每次调用生成新对象
+            namespace[f'_f_{name}'] = field_info.default_factory
+            params.append(f'{name}=_MISSING')
+            lines.append(f'    if {name} is _MISSING:\n        {name} = _f_{name}()')
+        else:
+            namespace[f'_d_{name}'] = field_info.default
+            params.append(f'{name}=_d_{name}')
+
+    source = '\n'.join((
+        f"def __fast_init__(*, {', '.join(params)}):",
+        *lines,
+        '    obj = _new(_cls)',
+        f"    _setattr(obj, '__dict__', {{{', '.join(f'{name!r}: {name}' for name in cls.model_fields)}}})",
+        "    _setattr(obj, '__pydantic_fields_set__', set(_fields))",
+        "    _setattr(obj, '__pydantic_extra__', None)",
+        "    _setattr(obj, '__pydantic_private__', None)",
+        '    return obj'
+    ))
+    exec(compile(source, f'<fast_init {cls.__name__}>', 'exec'), namespace)
+    return staticmethod(namespace['__fast_init__'])
+
+
+class _FastInitModel(BaseModel):
+    """
+    跳过校验直接构造，仅用于内部可信数据，如Sample.__fast_init__(signal=signal, features=features)
+    每个子类（包括用户继承的子类）各自生成__fast_init__，构造出的实例类型与字段都与该子类一致
+    """
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__fast_init__ = _compile_fast_init(cls)
+
+
+@dataclass(slots=True)
+class TickColumns:
+    """
+    逐笔成交列式存储(SoA)，每列为等长的一维连续数组
+    """
+    recv_ts: np.ndarray
+    exchange_ts: np.ndarray
+    price: np.ndarray
+    amount: np.ndarray
+    direction: np.ndarray
+
+    # 各列默认dtype：amount用float32、direction用int8以减少带宽，对精度敏感的品种可在from_array时覆盖
+    dtype_hint: ClassVar[Dict[str, Any]] = {
+        'recv_ts': np.float64,
+        'exchange_ts': np.float64,
+        'price': np.float64,
+        'amount': np.float32,
+        'direction': np.int8
+    }
+
+    def __len__(self):
+        return len(self.price)
+
+    @classmethod
+    def from_array(cls, _trades: np.ndarray, _dtype_hint: Optional[Dict[str, Any]] = None) -> 'TickColumns':
+        # 兼容行式数组 [[recv_ts, exchange_ts, price, amount, direction], ...]
+        trades = np.asarray(_trades, dtype=np.float64).reshape(-1, 5)
+        dtype_hint = cls.dtype_hint if _dtype_hint is None else {**cls.dtype_hint, **_dtype_hint}
+        return cls(**{
+            name: trades[:, i].astype(dtype_hint[name])
+            for i, name in enumerate(('recv_ts', 'exchange_ts', 'price', 'amount', 'direction'))
+        })
+
+    @classmethod
+    def from_records(cls, _trades: np.ndarray) -> 'TickColumns':
+        # 结构化数组(TRADE_DTYPE)按字段拆成连续的列
+        return cls(**{name: np.ascontiguousarray(_trades[name]) for name in TRADE_DTYPE.names})
+
+
+# 逐笔成交结构化dtype（行式记录），字段与TickColumns一致，供批量查询等接口使用
+TRADE_DTYPE = np.dtype(list(TickColumns.dtype_hint.items()))
+
+
+class Signal(_FastInitModel):
     batch_id: str  # str(uuid)
     symbol: Union[str, List[str]]  # 'btc_usdt|binance_future'
     price: Union[float, List[float]]  # positive if long, negative if short
@@ -17,48 +166,63 @@ class Signal(BaseModel):
     @model_validator(mode='after')
     def validate_price_and_symbol(cls, data):
         # 检查price和symbol的类型是否一致（都是单个值或都是列表）
-        if isinstance(data.price, list) != isinstance(data.symbol, list):
+        price_is_list = isinstance(data.price, list)
+        if price_is_list != isinstance(data.symbol, list):
             raise ValueError("price和symbol必须类型一致，要么都是单个值，要么都是列表")
-        
-        # 如果都是列表，检查长度是否相等
-        if isinstance(data.price, list) and isinstance(data.symbol, list):
-            if len(data.price) != len(data.symbol):
-                raise ValueError("当price和symbol都是列表时，长度必须相等")
-            
-        if isinstance(data.price, list):
-            data.price = [float(p) for p in data.price]
-        else:
-            data.price = float(data.price)
-        
+
+        # 都是列表，检查长度是否相等；price无论单个值还是列表都已由pydantic转换为float
+        if price_is_list and len(data.price) != len(data.symbol):
+            raise ValueError("当price和symbol都是列表时，长度必须相等")
         return data
 
+    @classmethod
+    def fast(cls, batch_id: str, symbol: Union[str, List[str]], price: Union[float, List[float]],
+             timestamp: float = 0, other_info: Optional[Dict[Hashable, Any]] = None) -> 'Signal':
+        """
+        跳过校验直接构造，仅用于内部可信数据（price已为float且与symbol一致）
+        """
+        return cls.__fast_init__(
+            batch_id=batch_id, symbol=symbol, price=price, timestamp=timestamp, other_info=other_info
+        )
 
-class Features(BaseModel):
-    feature_fields: List[str]
-    features: List[Optional[float]]
+    @property
+    def other_info_or_empty(self):
+        # 只读访问时用，未设置other_info时不分配新字典
+        return EMPTY_DICT if self.other_info is None else self.other_info
 
-    @model_validator(mode='after')
+
+
+class Features(_FastInitModel):
+    features: Dict[str, Optional[float]]  # {feature_field: value}
+
+    @model_validator(mode='before')
+    @classmethod
     def validate_features(cls, data):
-        if len(data.feature_fields) != len(data.features):
-            raise ValueError("feature_fields和features的长度必须相等")
-        
+        # 兼容旧的并行列表格式 feature_fields=[...], features=[...]
+        if isinstance(data, dict) and 'feature_fields' in data and not isinstance(data.get('features'), dict):
+            feature_fields, features = data['feature_fields'], data.get('features')
+            if features is None or len(feature_fields) != len(features):
+                raise ValueError("feature_fields和features的长度必须相等")
+            data = {k: v for k, v in data.items() if k != 'feature_fields'}
+            data['features'] = dict(zip(feature_fields, features))
         return data
 
+    @property
+    def feature_fields(self) -> List[str]:
+        return list(self.features)
+
     def as_dict(self):
-        return {field: value for field, value in zip(self.feature_fields, self.features)}
+        return dict(self.features)
     
     @classmethod
     def from_dict(cls, _features_dict: Dict[str, Optional[float]]):
-        return cls(
-            feature_fields=list(_features_dict.keys()),
-            features=list(_features_dict.values())
-        )
+        return cls(features=_features_dict)
     
-    def filter(self, _fields: List[str]):
-        return Features(
-            feature_fields=[field for field in self.feature_fields if field in _fields],
-            features=[value for field, value in zip(self.feature_fields, self.features) if field in _fields]
-        )
+    def filter(self, _fields: Union[List[str], Set[str], FrozenSet[str]]):
+        # 调用方传入集合时直接复用，避免每次重建
+        fields = _fields if isinstance(_fields, (set, frozenset)) else set(_fields)
+        # 值已校验过，跳过校验直接构造
+        return Features.__fast_init__(features={field: value for field, value in self.features.items() if field in fields})
     
     def update(self, other_features: 'Features'):
         """
@@ -73,18 +237,9 @@ class Features(BaseModel):
         if not isinstance(other_features, Features):
             raise ValueError("参数必须是Features类型")
         
-        # 创建字段到索引的映射，用于快速查找
-        current_field_map = {field: idx for idx, field in enumerate(self.feature_fields)}
-        
-        # 遍历要合并的features
-        for field, value in zip(other_features.feature_fields, other_features.features):
-            if field in current_field_map:
-                # 如果字段已存在，更新值
-                self.features[current_field_map[field]] = value
-            else:
-                # 如果字段不存在，添加新字段和值
-                self.feature_fields.append(field)
-                self.features.append(value)
+        # 已存在的字段更新值，不存在的字段追加在末尾
+        self.features.update(other_features.features)
+
 
 
 class Target(BaseModel):
@@ -104,64 +259,160 @@ class TradingResult(BaseModel):
     close_duration: Optional[float] = None
 
 
-class Sample(BaseModel):
+# Sample.pass_flags的位定义：*_SET表示对应结果已给出，另一位为其取值
+ACTUAL_PASS_SET = 0b0001
+ACTUAL_PASS = 0b0010
+FORCAST_PASS_SET = 0b0100
+FORCAST_PASS = 0b1000
+
+
+# 旧字段actual_pass/forcast_pass的校验器
+_OPTIONAL_BOOL = TypeAdapter(Optional[bool])
+
+
+def get_pass_flag(_flags: int, _set_bit: int, _value_bit: int) -> Optional[bool]:
+    if _flags & _set_bit:
+        return bool(_flags & _value_bit)
+    return None
+
+
+def set_pass_flag(_flags: int, _set_bit: int, _value_bit: int, _value: Optional[bool]) -> int:
+    _flags &= ~(_set_bit | _value_bit)
+    if _value is None:
+        return _flags
+    return _flags | _set_bit | (_value_bit if _value else 0)
+
+
+class Sample(_FastInitModel):
     signal: Signal
     features: Optional[Features] = None
     target: Optional[Target] = None
     forcast: Optional[Target] = None
-    actual_pass: Optional[bool] = None
-    forcast_pass: Optional[bool] = None
+    # actual_pass/forcast_pass压缩为一个整数，SampleBatch中为一列uint8，可直接做位运算筛选
+    pass_flags: int = 0
+
+    @model_validator(mode='before')
+    @classmethod
+    def validate_pass_flags(cls, data):
+        # 兼容旧字段 actual_pass=True, forcast_pass=False，按原Optional[bool]字段的规则转换，'false'为False，非法值报错
+        if isinstance(data, dict) and ('actual_pass' in data or 'forcast_pass' in data):
+            data = dict(data)
+            flags = data.get('pass_flags', 0)
+            if 'actual_pass' in data:
+                flags = set_pass_flag(flags, ACTUAL_PASS_SET, ACTUAL_PASS, _OPTIONAL_BOOL.validate_python(data.pop('actual_pass')))
+            if 'forcast_pass' in data:
+                flags = set_pass_flag(flags, FORCAST_PASS_SET, FORCAST_PASS, _OPTIONAL_BOOL.validate_python(data.pop('forcast_pass')))
+            data['pass_flags'] = flags
+        return data
+
+    @property
+    def actual_pass(self) -> Optional[bool]:
+        return get_pass_flag(self.pass_flags, ACTUAL_PASS_SET, ACTUAL_PASS)
+
+    @actual_pass.setter
+    def actual_pass(self, _value: Optional[bool]):
+        self.pass_flags = set_pass_flag(self.pass_flags, ACTUAL_PASS_SET, ACTUAL_PASS, _value)
+
+    @property
+    def forcast_pass(self) -> Optional[bool]:
+        return get_pass_flag(self.pass_flags, FORCAST_PASS_SET, FORCAST_PASS)
+
+    @forcast_pass.setter
+    def forcast_pass(self, _value: Optional[bool]):
+        self.pass_flags = set_pass_flag(self.pass_flags, FORCAST_PASS_SET, FORCAST_PASS, _value)
+
+
+
+@dataclass(slots=True)
+class SampleBatch:
+    """
+    样本批量列式存储，features为(n_samples, n_cols)的float32矩阵，列顺序由col_index给出，缺失值为nan
+    pass_flags为uint8列，如 (batch.pass_flags & (ACTUAL_PASS_SET | ACTUAL_PASS)) == (ACTUAL_PASS_SET | ACTUAL_PASS)
+    """
+    col_index: Dict[str, int]
+    features: np.ndarray
+    targets: np.ndarray
+    pass_flags: np.ndarray
+    signals: List[Signal]
+
+    def __len__(self):
+        return len(self.signals)
+
+    @classmethod
+    def from_samples(cls, _samples: List[Sample]) -> 'SampleBatch':
+        # 按字段首次出现的顺序建立列索引，各样本字段不一致时取并集
+        col_index: Dict[str, int] = {}
+        for sample in _samples:
+            if sample.features is not None:
+                for field in sample.features.features:
+                    col_index.setdefault(field, len(col_index))
+
+        nan = float('nan')
+        n_cols = len(col_index)
+        features = np.full((len(_samples), n_cols), np.nan, dtype=np.float32)
+        targets = np.full(len(_samples), np.nan, dtype=np.float32)
+        for i, sample in enumerate(_samples):
+            if sample.features is not None:
+                row = [nan] * n_cols
+                for field, value in sample.features.features.items():
+                    row[col_index[field]] = nan if value is None else value
+                features[i] = row
+            if sample.target is not None:
+                targets[i] = sample.target.target
+
+        pass_flags = np.fromiter((sample.pass_flags for sample in _samples), dtype=np.uint8, count=len(_samples))
+        return cls(col_index, features, targets, pass_flags, [sample.signal for sample in _samples])
 
 
 class SignalMgrParam(BaseModel):
     signal_method_name: str
-    signal_method_param: Dict[str, Any] = {}
+    signal_method_param: Dict[str, Any] = Field(default_factory=dict)
     cool_down_ts: Optional[float] = 1
 
 
 class FeatureMgrParam(BaseModel):
     feature_method_name: str
-    feature_method_param: Dict[str, Any] = {}
+    feature_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class TargetMgrParam(BaseModel):
     target_method_name: str
-    target_method_param: Dict[str, Any] = {}
+    target_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class SelectorMgrParam(BaseModel):
     selector_method_name: str
-    selector_method_param: Dict[str, Any] = {}
+    selector_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class ModelMgrParam(BaseModel):
     model_method_name: str
-    model_method_param: Dict[str, Any] = {}
+    model_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class PerformanceMgrParam(BaseModel):
     performance_method_name: str
-    performance_method_param: Dict[str, Any] = {}
+    performance_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class ExecuteMgrParam(BaseModel):
     execute_method_name: str
-    execute_method_param: Dict[str, Any] = {}
+    execute_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class OptimizeMgrParam(BaseModel):
     optimize_method_name: str
-    optimize_method_param: Dict[str, Any] = {}
+    optimize_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class RiskMgrParam(BaseModel):
     risk_method_name: str
-    risk_method_param: Dict[str, Any] = {}
+    risk_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class LiquidityMgrParam(BaseModel):
     liquidity_method_name: str
-    liquidity_method_param: Dict[str, Any] = {}
+    liquidity_method_param: Dict[str, Any] = Field(default_factory=dict)
 
 
 class SignalTaskParam(BaseModel):
@@ -223,73 +474,184 @@ class OnlineTaskParam(BaseModel):
     online_mode: Literal['replace', 'update'] = 'update'
 
 
-class UpdateOrderInfo(BaseModel):
+# 订单/嗅探器更新消息允许的状态，映射到intern后的STATUS_*常量，构造时替换为常量后状态可直接用is比较
+_UPDATE_ORDER_STATUS = {status: status for status in (
+    STATUS_WAITING, STATUS_TRIGGERED, STATUS_PARTIAL_FILLED, STATUS_CANCELING, STATUS_CANCELED, STATUS_ERROR, STATUS_FILLED
+)}
+_UPDATE_SNIFFER_STATUS = {status: status for status in (STATUS_WAITING, STATUS_TRIGGERED, STATUS_CANCELED, STATUS_ERROR)}
+
+
+def _check_update_fields(_info, _status_map: Dict[str, str]):
+    # 直接构造msgspec.Struct时不做类型检查（decode时才检查），这里补上，不合法时与原pydantic模型一样抛出ValueError
+    if not isinstance(_info.order_id, str):
+        raise ValueError(f"invalid order_id: {_info.order_id!r}")
+    status = _status_map.get(_info.status) if isinstance(_info.status, str) else None
+    if status is None:
+        raise ValueError(f"invalid status: {_info.status!r}")
+    _info.status = status
+    _info.exchange_timestamp = round(_to_float(_info.exchange_timestamp, 'exchange_timestamp'), 6)
+    _info.local_timestamp = round(_to_float(_info.local_timestamp, 'local_timestamp'), 6)
+
+
+def _to_float(_value, _name: str) -> float:
+    try:
+        return float(_value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid {_name}: {_value!r}") from None
+
+
+class UpdateOrderInfo(msgspec.Struct, kw_only=True, gc=False):
     """
-    更新订单信息
+    更新订单信息，每次交易所回调都会构造，使用msgspec.Struct代替pydantic校验，可由msgspec.json.decode直接解析
+    gc=False：字段中不会出现循环引用，不纳入GC追踪
     """
     order_id: str
-    status: Literal['waiting', 'triggered', 'partial_filled', 'canceling', 'canceled', 'error', 'filled']
+    status: str
     exchange_timestamp: float
     local_timestamp: float
-    execute_price: float = 0
-    execute_amount: float = 0
+    execute_price: float = 0.0
+    execute_amount: float = 0.0
     fee_rate: Optional[float] = None
     msg: Optional[Dict[str, Any]] = None
 
-    @field_validator('exchange_timestamp', 'local_timestamp')
-    @classmethod
-    def validate_timestamp_precision(cls, v):
-        if v is not None:
-            # 确保时间戳保留三位小数
-            return round(float(v), 6)
-        return v
+    def __post_init__(self):
+        _check_update_fields(self, _UPDATE_ORDER_STATUS)
+        self.execute_price = _to_float(self.execute_price, 'execute_price')
+        self.execute_amount = _to_float(self.execute_amount, 'execute_amount')
+        if self.fee_rate is not None:
+            self.fee_rate = _to_float(self.fee_rate, 'fee_rate')
 
 
-class UpdateSnifferInfo(BaseModel):
+class UpdateSnifferInfo(msgspec.Struct, kw_only=True, gc=False):
     """
     更新嗅探器信息
     """
     order_id: str
-    status: Literal['waiting', 'triggered', 'canceled', 'error']
+    status: str
     exchange_timestamp: float
     local_timestamp: float
 
-    @field_validator('exchange_timestamp', 'local_timestamp')
-    @classmethod
-    def validate_timestamp_precision(cls, v):
-        if v is not None:
-            # 确保时间戳保留三位小数
-            return round(float(v), 6)
-        return v
+    def __post_init__(self):
+        _check_update_fields(self, _UPDATE_SNIFFER_STATUS)
+
 
+# 交易所推送的JSON直接解码为更新消息（会执行__post_init__），Decoder只构建一次
+# 解码失败（包括__post_init__中的ValueError）统一抛出msgspec.ValidationError，它不是ValueError的子类
+# BATCH版本一次解码整个JSON数组，如 b'[{"order_id": ...}, ...]'
+UPDATE_ORDER_DECODER = msgspec.json.Decoder(UpdateOrderInfo)
+UPDATE_ORDER_BATCH_DECODER = msgspec.json.Decoder(List[UpdateOrderInfo])
+UPDATE_SNIFFER_DECODER = msgspec.json.Decoder(UpdateSnifferInfo)
+UPDATE_SNIFFER_BATCH_DECODER = msgspec.json.Decoder(List[UpdateSnifferInfo])
 
-class PrecisionDict(BaseModel):
+
+def _to_precision(_value, _name: str) -> int:
+    # 与原pydantic int字段一致：接受整数或整数值的float/str，拒绝2.7这类会被int()截断的值
+    if isinstance(_value, int):
+        return int(_value)
+    if isinstance(_value, float) and _value.is_integer():
+        return int(_value)
+    if isinstance(_value, str):
+        try:
+            return int(_value)
+        except ValueError:
+            pass
+    raise ValueError(f"invalid {_name} precision: {_value!r}")
+
+
+class PrecisionDict:
     """
     精度字典
     """
-    price: int
-    amount: int
+    __slots__ = ('price', 'amount', 'price_factor', 'amount_factor')
+
+    def __init__(self, price: int, amount: int):
+        price, amount = _to_precision(price, 'price'), _to_precision(amount, 'amount')
+        # 精度设置时预先计算10的幂次，避免每次format时重复计算；设置后只读，保证factor与精度一致
+        object.__setattr__(self, 'price', price)
+        object.__setattr__(self, 'amount', amount)
+        object.__setattr__(self, 'price_factor', 10 ** price)
+        object.__setattr__(self, 'amount_factor', 10 ** amount)
+
+    def __setattr__(self, _name, _value):
+        raise AttributeError("PrecisionDict is read-only, create a new one instead")
+
+    def __reduce__(self):
+        return self.__class__, (self.price, self.amount)
+
+    def __repr__(self):
+        return f"PrecisionDict(price={self.price}, amount={self.amount})"
+
+    def __eq__(self, other):
+        if not isinstance(other, PrecisionDict):
+            return NotImplemented
+        return self.price == other.price and self.amount == other.amount
+
+    def __hash__(self):
+        return hash((self.price, self.amount))
+
+    @classmethod
+    def from_precision(cls, _price: int, _amount: int) -> 'PrecisionDict':
+        return cls(_price, _amount)
+
+
+ORDER_TYPES = frozenset(('market', 'limit', 'condition_limit', 'condition_market'))
+ORDER_ACTIONS = frozenset(('open', 'close'))
+ORDER_POSITIONS = frozenset(('long', 'short'))
+ORDER_FEATURES = frozenset(('fok', 'fak', 'gtx', 'queue'))
+# 需要指定price的订单类型
+PRICED_ORDER_TYPES = frozenset(('limit', 'condition_limit'))
+ORDER_STATUS_INTERN = {**_UPDATE_ORDER_STATUS, STATUS_PENDING: STATUS_PENDING}
 
 
-class OrderInfo(BaseModel):
+def check_order_fields(_order) -> Tuple[str, int]:
+    """
+    OrderInfo与fastSchemaUtil.OrderInfo共用的取值检查，不合法时抛出ValueError
+    取值检查用frozenset成员判断代替逐字段的Literal校验
+    :param _order: OrderInfo / fastSchemaUtil.OrderInfo
+    :return: (intern后的status, 根据position和action得到的direction)
+    """
+    if _order.order_type not in ORDER_TYPES:
+        raise ValueError(f"invalid order_type: {_order.order_type}")
+    if _order.action not in ORDER_ACTIONS:
+        raise ValueError(f"invalid action: {_order.action}")
+    if _order.position not in ORDER_POSITIONS:
+        raise ValueError(f"invalid position: {_order.position}")
+    if _order.feature is not None and _order.feature not in ORDER_FEATURES:
+        raise ValueError(f"invalid feature: {_order.feature}")
+    status = ORDER_STATUS_INTERN.get(_order.status)
+    if status is None:
+        raise ValueError(f"invalid status: {_order.status}")
+
+    # 当order_type为limit或condition_limit时，price不可为空
+    if _order.price is None and _order.feature != 'queue' and _order.order_type in PRICED_ORDER_TYPES:
+        raise ValueError(f"当order_type为'{_order.order_type}'时，price字段不能为空")
+
+    # 查表代替逐个字符串比较，position和action已在上面校验过，键必然存在
+    return status, POSITION_ACTION_DIRECTION[(_order.position, _order.action)]
+
+
+class OrderInfo(_FastInitModel):
     """
     订单信息
     """
+    # update()中直接赋值已处理好的值，赋值时不再触发校验
+    model_config = ConfigDict(validate_assignment=False)
+
     order_id: str
     batch_id: str
     symbol: str
     exchange: str
-    order_type: Literal['market', 'limit', 'condition_limit', 'condition_market']
-    action: Literal['open', 'close']
-    position: Literal['long', 'short']
-    direction: Literal[-1, 0, 1] = 0
+    order_type: str  # 'market', 'limit', 'condition_limit', 'condition_market'
+    action: str  # 'open', 'close'
+    position: str  # 'long', 'short'
+    direction: int = 0  # -1, 0, 1
     amount: float
-    feature: Optional[Literal['fok', 'fak', 'gtx', 'queue']] = None
+    feature: Optional[str] = None  # 'fok', 'fak', 'gtx', 'queue'
     expire: Optional[float] = None
     delay: Optional[float] = None
     condition: Optional[Dict[str, Any]] = None
     price: Optional[float] = None
-    status: Literal['pending', 'waiting', 'triggered', 'partial_filled', 'canceling', 'canceled', 'error', 'filled'] = 'pending'
+    status: str = STATUS_PENDING
     current_timestamp: float
     send_timestamp: Optional[float] = None
     receive_timestamp: Optional[float] = None
@@ -297,62 +659,185 @@ class OrderInfo(BaseModel):
     local_timestamp: Optional[float] = None
     trigger_timestamp: Optional[float] = None
     trigger_local_timestamp: Optional[float] = None
-    execute_price: float = 0
-    execute_amount: float = 0
+    execute_price: float = 0.0
+    execute_amount: float = 0.0
     fee_rate: Optional[float] = None
     msg: Optional[Dict[str, Any]] = None
 
-    @field_validator('current_timestamp', 'send_timestamp', 'receive_timestamp', 'exchange_timestamp', 'local_timestamp', 'trigger_timestamp', 'trigger_local_timestamp')
-    @classmethod
-    def validate_timestamp_precision(cls, v):
-        if v is not None:
-            # 确保时间戳保留三位小数
-            return round(float(v), 6)
-        return v
+    validate_timestamp_precision = field_validator(
+        'current_timestamp', 'send_timestamp', 'receive_timestamp', 'exchange_timestamp', 'local_timestamp',
+        'trigger_timestamp', 'trigger_local_timestamp'
+    )(_round_timestamp)
 
     @model_validator(mode='after')
-    def validate_direction(cls, data):
-        # 根据position和action自动设置direction
-        if data.position == 'long' and data.action == 'open':
-            data.direction = 1
-        elif data.position == 'long' and data.action == 'close':
-            data.direction = -1
-        elif data.position == 'short' and data.action == 'open':
-            data.direction = -1
-        elif data.position == 'short' and data.action == 'close':
-            data.direction = 1
-        return data
-    
-    @model_validator(mode='after')
-    def validate_price_required(cls, data):
-        # 当order_type为limit或condition_limit时，price不可为空
-        if data.order_type in ['limit', 'condition_limit'] and data.price is None and data.feature != 'queue':
-            raise ValueError(f"当order_type为'{data.order_type}'时，price字段不能为空")
+    def validate_order(cls, data):
+        # 取值检查、direction设置、price检查合并在同一个validator中，只调度一次
+        status, direction = check_order_fields(data)
+        # 直接写入__dict__，绕过BaseModel.__setattr__（其开销与整个校验相当），同时保持fields_set一致
+        data.__dict__['status'] = status
+        data.__dict__['direction'] = direction
+        data.__pydantic_fields_set__.add('direction')
         return data
     
+    @classmethod
+    def fast(cls, **data) -> 'OrderInfo':
+        """
+        跳过校验直接构造，仅用于内部可信数据（反序列化、回测复制等），时间戳需已保留6位小数
+        direction仍根据position和action设置
+        """
+        data['direction'] = POSITION_ACTION_DIRECTION[(data['position'], data['action'])]
+        return cls.__fast_init__(**data)
+
     def update(self, _update_info: UpdateOrderInfo):
-        self.status = _update_info.status
-        self.exchange_timestamp = round(_update_info.exchange_timestamp, 6)
-        self.local_timestamp = round(_update_info.local_timestamp, 6)
-        self.execute_price = float(_update_info.execute_price)
-        self.execute_amount = float(_update_info.execute_amount)
+        # 时间戳在UpdateOrderInfo.__post_init__中已保留6位小数，直接赋值
+        status = _update_info.status
+        self.status = status
+        self.exchange_timestamp = _update_info.exchange_timestamp
+        self.local_timestamp = _update_info.local_timestamp
+        self.execute_price = _update_info.execute_price
+        self.execute_amount = _update_info.execute_amount
         self.fee_rate = _update_info.fee_rate
         self.msg = _update_info.msg
 
-        if _update_info.status == 'triggered':
-            self.trigger_timestamp = round(_update_info.exchange_timestamp, 6)
-            self.trigger_local_timestamp = round(_update_info.local_timestamp, 6)
-    
-    # 添加属性设置器，确保单独赋值时也保持三位小数精度
-    def __setattr__(self, name, value):
-        if name in ['current_timestamp', 'send_timestamp', 'receive_timestamp', 'exchange_timestamp', 'local_timestamp'] and value is not None:
-            value = round(float(value), 6)
-        elif name == 'price' and value is not None:
-            value = float(value)
-        super().__setattr__(name, value)
+        # 用==而非is：msgspec.structs.replace等方式构造的消息不经过__post_init__，status未必是intern常量
+        if status == STATUS_TRIGGERED:
+            self.trigger_timestamp = self.exchange_timestamp
+            self.trigger_local_timestamp = self.local_timestamp
+
+
+
+# OrderStore中status列的编码，按订单生命周期排序
+ORDER_STATUS_CODE = {status: code for code, status in enumerate((
+    STATUS_PENDING, STATUS_WAITING, STATUS_TRIGGERED, STATUS_PARTIAL_FILLED, STATUS_CANCELING,
+    STATUS_CANCELED, STATUS_ERROR, STATUS_FILLED
+))}
+
+
+class OrderStore:
+    """
+    订单列式存储，数值字段按列保存为numpy数组，统计时直接对列做向量化运算
+    原OrderInfo对象按行保留，view()返回，对外接口仍使用OrderInfo
+    订单状态更新后需再次append()，按order_id覆盖原有行
+    """
+    __slots__ = ('_size', '_rows', '_orders', '_columns')
+
+    _dtypes: ClassVar[Dict[str, type]] = {
+        'status': np.int8,
+        'direction': np.int8,
+        'amount': np.float64,
+        'execute_price': np.float64,
+        'execute_amount': np.float64,
+        'current_timestamp': np.float64,
+        'exchange_timestamp': np.float64,
+        'local_timestamp': np.float64,
+    }
+
+    def __init__(self, _capacity: int = 1024):
+        self._size = 0
+        # {order_id: row_idx}
+        self._rows: Dict[str, int] = {}
+        self._orders: List[OrderInfo] = []
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(max(_capacity, 1), dtype=dtype) for name, dtype in self._dtypes.items()
+        }
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, _order_id: str):
+        return _order_id in self._rows
+
+    def __getitem__(self, _name: str) -> np.ndarray:
+        """
+        返回长度为len(self)的列视图，如store['execute_amount'].sum()
+        :param _name: 列名，见OrderStore._dtypes
+        """
+        return self._columns[_name][:self._size]
+
+    def append(self, _order_info: OrderInfo) -> int:
+        """
+        写入一个订单，order_id已存在时覆盖原有行
+        :param _order_info: 订单信息
+        :return: 行号
+        """
+        row = self._rows.get(_order_info.order_id)
+        if row is None:
+            row = self._size
+            if row == len(self._columns['status']):
+                self._grow()
+            self._rows[_order_info.order_id] = row
+            self._orders.append(_order_info)
+            self._size += 1
+        else:
+            self._orders[row] = _order_info
+
+        columns = self._columns
+        nan = np.nan
+        columns['status'][row] = ORDER_STATUS_CODE[_order_info.status]
+        columns['direction'][row] = _order_info.direction
+        columns['amount'][row] = _order_info.amount
+        columns['execute_price'][row] = _order_info.execute_price
+        columns['execute_amount'][row] = _order_info.execute_amount
+        columns['current_timestamp'][row] = _order_info.current_timestamp
+        # 未回报的时间戳记为nan
+        exchange_timestamp = _order_info.exchange_timestamp
+        columns['exchange_timestamp'][row] = nan if exchange_timestamp is None else exchange_timestamp
+        local_timestamp = _order_info.local_timestamp
+        columns['local_timestamp'][row] = nan if local_timestamp is None else local_timestamp
+        return row
+
+    def view(self, _row_idx: int) -> OrderInfo:
+        return self._orders[_row_idx]
+
+    def row_of(self, _order_id: str) -> Optional[int]:
+        return self._rows.get(_order_id)
+
+    def status_mask(self, *_status: str) -> np.ndarray:
+        """
+        :param _status: 一个或多个订单状态，如STATUS_FILLED, STATUS_PARTIAL_FILLED
+        :return: 状态属于其中之一的行为True
+        """
+        return np.isin(self['status'], [ORDER_STATUS_CODE[status] for status in _status])
+
+    def signed_execute_amount(self) -> np.ndarray:
+        """
+        带方向的成交数量，开多/平空为正，开空/平多为负，sum()即为净头寸变化
+        """
+        return self['execute_amount'] * self['direction']
+
+    def execute_value(self) -> np.ndarray:
+        """
+        成交金额，sum()即为总成交额
+        """
+        return self['execute_amount'] * self['execute_price']
+
+    def _grow(self):
+        # 容量翻倍，append均摊O(1)
+        for name, column in self._columns.items():
+            new_column = np.empty(len(column) * 2, dtype=column.dtype)
+            new_column[:self._size] = column[:self._size]
+            self._columns[name] = new_column
+
 
+class _SnifferInfoBase(BaseModel):
+    """
+    嗅探器信息公共部分：时间戳校验和状态更新，字段由子类定义
+    """
+    # update()中直接赋值已处理好的值，赋值时不再触发校验
+    model_config = ConfigDict(validate_assignment=False)
+
+    validate_timestamp_precision = field_validator(
+        'current_timestamp', 'exchange_timestamp', 'local_timestamp', check_fields=False
+    )(_round_timestamp)
 
-class TargetSnifferInfo(BaseModel):
+    def update(self, _update_info: UpdateSnifferInfo):
+        # 时间戳在UpdateSnifferInfo.__post_init__中已保留6位小数
+        self.status = _update_info.status
+        self.exchange_timestamp = _update_info.exchange_timestamp
+        self.local_timestamp = _update_info.local_timestamp
+
+
+class TargetSnifferInfo(_SnifferInfoBase):
     """
     目标嗅探器信息
     """
@@ -370,27 +855,8 @@ class TargetSnifferInfo(BaseModel):
     local_timestamp: Optional[float] = None
     drop: bool = True
 
-    @field_validator('current_timestamp', 'exchange_timestamp', 'local_timestamp')
-    @classmethod
-    def validate_timestamp_precision(cls, v):
-        if v is not None:
-            # 确保时间戳保留三位小数
-            return round(float(v), 6)
-        return v
-
-    def update(self, _update_info: UpdateSnifferInfo):
-        self.status = _update_info.status
-        self.exchange_timestamp = round(_update_info.exchange_timestamp, 6)
-        self.local_timestamp = round(_update_info.local_timestamp, 6)
-    
-    # 添加属性设置器，确保单独赋值时也保持三位小数精度
-    def __setattr__(self, name, value):
-        if name in ['current_timestamp', 'exchange_timestamp', 'local_timestamp'] and value is not None:
-            value = round(float(value), 6)
-        super().__setattr__(name, value)
 
-
-class TrailingSnifferInfo(BaseModel):
+class TrailingSnifferInfo(_SnifferInfoBase):
     """
     追踪嗅探器信息
     """
@@ -407,32 +873,20 @@ class TrailingSnifferInfo(BaseModel):
     current_timestamp: float
     exchange_timestamp: Optional[float] = None
     local_timestamp: Optional[float] = None
-    other_info: Dict[str, Any] = {}
+    # 多数实例不需要other_info，默认不分配字典；写入前先判断 if self.other_info is None: self.other_info = {}
+    other_info: Optional[Dict[str, Any]] = None
     drop: bool = True
 
-    @field_validator('current_timestamp', 'exchange_timestamp', 'local_timestamp')
-    @classmethod
-    def validate_timestamp_precision(cls, v):
-        if v is not None:
-            # 确保时间戳保留三位小数
-            return round(float(v), 6)
-        return v
-
-    def update(self, _update_info: UpdateSnifferInfo):
-        self.status = _update_info.status
-        self.exchange_timestamp = round(_update_info.exchange_timestamp, 6)
-        self.local_timestamp = round(_update_info.local_timestamp, 6)
-    
-    # 添加属性设置器，确保单独赋值时也保持三位小数精度
-    def __setattr__(self, name, value):
-        if name in ['current_timestamp', 'exchange_timestamp', 'local_timestamp'] and value is not None:
-            value = round(float(value), 6)
-        super().__setattr__(name, value)
+    @property
+    def other_info_or_empty(self):
+        # 只读访问时用，未设置other_info时不分配新字典
+        return EMPTY_DICT if self.other_info is None else self.other_info
 
 
-class EarningInfo(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class EarningInfo:
     """
-    盈利信息
+    盈利信息，内部按批次构造后只读，无需pydantic校验
     """
     batch_id: str
     start_timestamp: float